@@ -1,5 +1,7 @@
 # app.py
 import os
+import math
+import time
 from functools import wraps
 from datetime import datetime
 from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
@@ -10,18 +12,38 @@ import psycopg2, psycopg2.extras
 # Flask-SocketIO for real-time
 from flask_socketio import SocketIO, emit, join_room, leave_room
 
-# ====== DB CONFIG (PGAdmin) ======
-DB_HOST = os.environ.get('DB_HOST', 'localhost')
-DB_NAME = os.environ.get('DB_NAME', 'swiftserve')
-DB_USER = os.environ.get('DB_USER', 'postgres')
-DB_PASS = os.environ.get('DB_PASS', 'Sachin@14')
-DB_PORT = os.environ.get('DB_PORT', '5432')
+# Fingerprinted static bundles (built by `python assets.py`)
+from assets import BUNDLES, STATIC_DIR, SOCKETIO_CLIENT, SOCKETIO_CLIENT_URL, load_manifest
+
+# DB connection (config in db.py) and versioned schema migrations (`python migrate.py`)
+from db import get_conn
+from migrate import pending_migrations
 
 # Video source mode: 'online' or 'local'
 VIDEO_SOURCE_MODE = os.environ.get('VIDEO_SOURCE_MODE', 'local').lower()
 
-def get_conn():
-    return psycopg2.connect(host=DB_HOST, dbname=DB_NAME, user=DB_USER, password=DB_PASS, port=DB_PORT)
+# Live tracking: min seconds between location emits per order, min movement
+# (in 1e-5 degree units, ~1 m) before a new point is pushed, and how often a
+# full keyframe is sent instead of a delta so watchers can resync.
+LOCATION_MIN_INTERVAL = float(os.environ.get('LOCATION_MIN_INTERVAL', '3'))
+LOCATION_MIN_MOVE = int(os.environ.get('LOCATION_MIN_MOVE', '5'))
+LOCATION_KEYFRAME_EVERY = int(os.environ.get('LOCATION_KEYFRAME_EVERY', '10'))
+# Positions not refreshed within this many seconds are dropped.
+LOCATION_TTL = float(os.environ.get('LOCATION_TTL', '300'))
+# Fixes for orders the agent may not track are ignored for this long before
+# the assignment is checked against the DB again.
+LOCATION_DENY_TTL = float(os.environ.get('LOCATION_DENY_TTL', '30'))
+
+def check_schema():
+    """Fail fast at startup if any shipped migration has not been applied."""
+    conn = get_conn()
+    try:
+        missing = pending_migrations(conn)
+    finally:
+        conn.close()
+    if missing:
+        names = ', '.join(f'{version:04d}_{name}' for version, name in missing)
+        raise RuntimeError(f'Database is missing migrations: {names}. Run `python migrate.py`.')
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'swiftserve_secret')
@@ -33,6 +55,33 @@ UPLOAD_FOLDER = 'static/uploads'
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
+# Verify the schema once per process, whatever the entry point (python app.py,
+# flask run, gunicorn), so request paths can rely on it.
+check_schema()
+
+# Asset manifest is read once at startup; without a build, the unbundled sources
+# are served, with the pinned CDN copy of the Socket.IO client if it isn't vendored.
+ASSET_MANIFEST = load_manifest()
+HASHED_ASSETS = set(ASSET_MANIFEST.values())
+SOCKETIO_CLIENT_VENDORED = os.path.exists(os.path.join(STATIC_DIR, SOCKETIO_CLIENT))
+
+@app.template_global()
+def asset_urls(bundle):
+    """URLs to include for a bundle: the hashed file if built, else its sources."""
+    if bundle in ASSET_MANIFEST:
+        return [url_for('static', filename=ASSET_MANIFEST[bundle])]
+    return [SOCKETIO_CLIENT_URL if src == SOCKETIO_CLIENT and not SOCKETIO_CLIENT_VENDORED
+            else url_for('static', filename=src) for src in BUNDLES[bundle]]
+
+@app.after_request
+def cache_static_assets(resp):
+    # hashed filenames change with content, so they can be cached forever
+    # (only files named in the manifest; the manifest itself is not hashed)
+    prefix = f'{app.static_url_path}/'
+    if resp.status_code == 200 and request.path.startswith(prefix) and request.path[len(prefix):] in HASHED_ASSETS:
+        resp.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return resp
+
 # ========= Helpers =========
 def login_required(role=None):
     def decorator(f):
@@ -82,6 +131,100 @@ def broadcast_order_update(order_id, status, extra=None):
         payload.update(extra)
     # Emit to all connected clients. In future you can target rooms (per-order or per-user).
     socketio.emit('order_update', payload)
+    # live tracking only applies while the order is out for delivery
+    if status != 'Out for Delivery':
+        clear_agent_location(order_id)
+    else:
+        for key in [key for key in denied_locations if key[0] == order_id]:
+            denied_locations.pop(key, None)
+
+# Latest agent position per order: order_id -> dict. Only the newest point is
+# kept, along with the last point actually emitted (the delta base).
+live_locations = {}
+# (order_id, agent_id) -> monotonic time until which that agent's fixes are ignored
+denied_locations = {}
+last_location_prune = 0.0
+
+def location_keyframe(order_id, loc):
+    return {'o': order_id, 'k': [loc['sent_lat'], loc['sent_lng']]}
+
+def get_agent_location(order_id):
+    """Live entry for an order, or None if there is none or it has expired."""
+    loc = live_locations.get(order_id)
+    if loc and time.monotonic() - loc['updated_at'] > LOCATION_TTL:
+        clear_agent_location(order_id)
+        return None
+    return loc
+
+def prune_agent_locations(now):
+    # drop entries whose agent stopped sending; runs at most once per TTL
+    global last_location_prune
+    if now - last_location_prune < LOCATION_TTL:
+        return
+    last_location_prune = now
+    for oid in [oid for oid, loc in live_locations.items() if now - loc['updated_at'] > LOCATION_TTL]:
+        live_locations.pop(oid, None)
+    for key in [key for key, until in denied_locations.items() if until <= now]:
+        denied_locations.pop(key, None)
+
+def location_moved(loc):
+    # GPS jitter below LOCATION_MIN_MOVE never counts as movement
+    return (abs(loc['lat'] - loc['sent_lat']) >= LOCATION_MIN_MOVE
+            or abs(loc['lng'] - loc['sent_lng']) >= LOCATION_MIN_MOVE)
+
+def emit_agent_location(order_id, loc, now):
+    """Send the stored position as a delta (or periodic keyframe) if it moved."""
+    if not location_moved(loc):
+        return
+    dlat = loc['lat'] - loc['sent_lat']; dlng = loc['lng'] - loc['sent_lng']
+    loc['sent_lat'] = loc['lat']; loc['sent_lng'] = loc['lng']; loc['sent_at'] = now
+    loc['count'] += 1
+    if loc['count'] % LOCATION_KEYFRAME_EVERY == 0:
+        payload = location_keyframe(order_id, loc)
+    else:
+        payload = {'o': order_id, 'd': [dlat, dlng]}
+    emit_to_order_room(order_id, 'agent_location', payload)
+
+def flush_agent_location(order_id, loc, delay):
+    # trailing edge: send a held-back point once the interval ends, even if
+    # the agent has stopped sending fixes (unless it has drifted back within
+    # LOCATION_MIN_MOVE of the last emitted point)
+    socketio.sleep(delay)
+    loc['flush_pending'] = False
+    if live_locations.get(order_id) is loc:
+        emit_agent_location(order_id, loc, time.monotonic())
+
+def push_agent_location(order_id, agent_id, lat, lng):
+    """Record an agent position and emit it to the order room if due.
+
+    Positions are stored as integers in 1e-5 degrees. Points within
+    LOCATION_MIN_MOVE of the last emitted point are only stored. Points that moved
+    but arrive within LOCATION_MIN_INTERVAL are flushed when the interval ends;
+    otherwise the room gets a delta against the last emitted point (or a full
+    keyframe every LOCATION_KEYFRAME_EVERY emits).
+    """
+    lat = int(round(lat * 1e5)); lng = int(round(lng * 1e5))
+    now = time.monotonic()
+    loc = live_locations.get(order_id)
+    if loc is None or loc['agent_id'] != agent_id:
+        loc = {'agent_id': agent_id, 'lat': lat, 'lng': lng, 'updated_at': now,
+               'sent_lat': lat, 'sent_lng': lng, 'sent_at': now, 'count': 0,
+               'flush_pending': False}
+        live_locations[order_id] = loc
+        emit_to_order_room(order_id, 'agent_location', location_keyframe(order_id, loc))
+        return
+    loc['lat'] = lat; loc['lng'] = lng; loc['updated_at'] = now
+    if not location_moved(loc):
+        return
+    elapsed = now - loc['sent_at']
+    if elapsed >= LOCATION_MIN_INTERVAL:
+        emit_agent_location(order_id, loc, now)
+    elif not loc['flush_pending']:
+        loc['flush_pending'] = True
+        socketio.start_background_task(flush_agent_location, order_id, loc, LOCATION_MIN_INTERVAL - elapsed)
+
+def clear_agent_location(order_id):
+    live_locations.pop(order_id, None)
 
 # ========= Public / Customer =========
 @app.route('/')
@@ -126,26 +269,17 @@ def register():
 
         pw = generate_password_hash(password)
         conn = get_conn(); cur = conn.cursor()
-        # Try insert including phone if DB supports it, otherwise fallback without phone.
+        # users.phone is guaranteed by the schema version checked at startup
         try:
             cur.execute("""
                 INSERT INTO users (username, gmail, password_hash, role, phone)
                 VALUES (%s, %s, %s, %s, %s)
             """, (username, gmail, pw, role, phone))
             conn.commit()
-        except Exception as e:
+        except psycopg2.Error:
             conn.rollback()
-            # fallback: try without phone column (in case schema older)
-            try:
-                cur.execute("""
-                    INSERT INTO users (username, gmail, password_hash, role)
-                    VALUES (%s, %s, %s, %s)
-                """, (username, gmail, pw, role))
-                conn.commit()
-            except Exception as e2:
-                conn.rollback()
-                flash('Email already exists or invalid input.')
-                cur.close(); conn.close(); return redirect(url_for('register'))
+            flash('Email already exists or invalid input.')
+            cur.close(); conn.close(); return redirect(url_for('register'))
 
         cur.close(); conn.close()
         flash('Registration successful! Please log in.')
@@ -694,11 +828,61 @@ def on_disconnect():
 # join per-order room if client requests (useful for targeted updates)
 @socketio.on('join_order_room')
 def handle_join(data):
-    order_id = data.get('order_id')
-    if order_id:
-        room = f'order_{order_id}'
-        join_room(room)
-        emit('joined', {'room': room})
+    uid = session.get('user_id')
+    try:
+        order_id = int(data.get('order_id'))
+    except (AttributeError, TypeError, ValueError):
+        return
+    if not uid:
+        return
+    # the room carries the agent's live position, so only the customer
+    # and the assigned agent may join
+    conn=get_conn(); cur=conn.cursor()
+    try:
+        cur.execute('SELECT user_id, agent_id FROM orders WHERE id=%s', (order_id,))
+        row = cur.fetchone()
+    finally:
+        cur.close(); conn.close()
+    if not row or uid not in (row[0], row[1]):
+        return
+    room = f'order_{order_id}'
+    join_room(room)
+    emit('joined', {'room': room})
+    # late joiners start from the last emitted point
+    loc = get_agent_location(order_id)
+    if loc:
+        emit('agent_location', location_keyframe(order_id, loc))
+
+# agent pushes GPS fixes for an order they are delivering
+@socketio.on('agent_location')
+def handle_agent_location(data):
+    agent_id = session.get('user_id')
+    if session.get('role') != 'agent':
+        return
+    try:
+        order_id = int(data.get('order_id')); lat = float(data.get('lat')); lng = float(data.get('lng'))
+    except (AttributeError, TypeError, ValueError):
+        return
+    if not (math.isfinite(lat) and math.isfinite(lng) and -90 <= lat <= 90 and -180 <= lng <= 180):
+        return
+    now = time.monotonic()
+    prune_agent_locations(now)
+    loc = get_agent_location(order_id)
+    if not loc or loc['agent_id'] != agent_id:
+        if denied_locations.get((order_id, agent_id), 0) > now:
+            return
+        # first fix for this order: verify the assignment once, then trust the
+        # cache until the order leaves 'Out for Delivery' or the entry expires
+        conn=get_conn(); cur=conn.cursor()
+        try:
+            cur.execute("SELECT agent_id FROM orders WHERE id=%s AND status='Out for Delivery'", (order_id,))
+            row = cur.fetchone()
+        finally:
+            cur.close(); conn.close()
+        if not row or row[0] != agent_id:
+            denied_locations[(order_id, agent_id)] = now + LOCATION_DENY_TTL
+            return
+    push_agent_location(order_id, agent_id, lat, lng)
 
 # Optionally: emit to order room in broadcast helper (not used by default)
 def emit_to_order_room(order_id, event, payload):
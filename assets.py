@@ -0,0 +1,108 @@
+# assets.py
+# Static asset pipeline: bundles + minifies CSS/JS into static/dist with
+# content-hashed filenames and writes static/dist/manifest.json.
+#
+#   python assets.py          (run at deploy time, after editing CSS/JS)
+import os
+import re
+import json
+import hashlib
+import urllib.request
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+DIST_DIR = 'dist'
+MANIFEST = os.path.join(STATIC_DIR, DIST_DIR, 'manifest.json')
+
+# Self-hosted Socket.IO client (pinned to the version the server is tested with).
+# The version is part of the vendored filename so bumping it forces a re-fetch.
+SOCKETIO_VERSION = '4.7.2'
+SOCKETIO_CLIENT = f'vendor/socket.io-{SOCKETIO_VERSION}.min.js'
+SOCKETIO_CLIENT_URL = f'https://cdnjs.cloudflare.com/ajax/libs/socket.io/{SOCKETIO_VERSION}/socket.io.min.js'
+# sha256 (hex) of the upstream socket.io.min.js dist file for SOCKETIO_VERSION;
+# update it together with SOCKETIO_VERSION.
+SOCKETIO_CLIENT_SHA256 = '83df4abc7eec941f1d29ae254e80bac0bb82d398fbe2e8ee4ea2a7efc8e704f1'
+
+# bundle name -> source files (relative to static/), in load order.
+# The socket client lives only in app.js so every page opens exactly one socket.
+BUNDLES = {
+    'app.css': ['css/style.css'],
+    'app.js': [SOCKETIO_CLIENT, 'js/app.js'],
+}
+
+def minify_css(src):
+    src = re.sub(r'/\*.*?\*/', '', src, flags=re.S)
+    src = re.sub(r'\s+', ' ', src)
+    src = re.sub(r'\s*([{};,>])\s*', r'\1', src)
+    src = re.sub(r':\s+', ':', src)  # space before ':' is a descendant selector; keep it
+    return src.replace(';}', '}').strip()
+
+def minify_js(src):
+    # Conservative: only drops whole-line comments, indentation and blank lines,
+    # so string literals are never touched (keep template literals single-line).
+    out = []
+    for line in src.splitlines():
+        line = line.strip()
+        if line and not line.startswith('//'):
+            out.append(line)
+    return '\n'.join(out)
+
+def sha256_hex(data):
+    return hashlib.sha256(data).hexdigest()
+
+def fetch_socketio_client():
+    """Download the pinned client into static/vendor, verifying its sha256."""
+    path = os.path.join(STATIC_DIR, SOCKETIO_CLIENT)
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if sha256_hex(f.read()) == SOCKETIO_CLIENT_SHA256:
+                return
+    print(f'fetching {SOCKETIO_CLIENT_URL}')
+    with urllib.request.urlopen(SOCKETIO_CLIENT_URL) as r:
+        data = r.read()
+    digest = sha256_hex(data)
+    if digest != SOCKETIO_CLIENT_SHA256:
+        raise SystemExit(f'sha256 mismatch for {SOCKETIO_CLIENT_URL}: got {digest}, '
+                         f'expected {SOCKETIO_CLIENT_SHA256}')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+def build():
+    fetch_socketio_client()
+    os.makedirs(os.path.join(STATIC_DIR, DIST_DIR), exist_ok=True)
+    manifest = {}
+    for name, sources in BUNDLES.items():
+        parts = []
+        for rel in sources:
+            with open(os.path.join(STATIC_DIR, rel), encoding='utf-8') as f:
+                src = f.read()
+            if rel.endswith('.min.js'):
+                # the .map file is not vendored, so drop the dangling reference
+                parts.append(re.sub(r'\n//# sourceMappingURL=\S+\s*$', '', src))
+            elif name.endswith('.css'):
+                parts.append(minify_css(src))
+            else:
+                parts.append(minify_js(src))
+        # ';' keeps concatenated scripts from running into each other
+        body = ('\n' if name.endswith('.css') else '\n;\n').join(parts)
+        digest = hashlib.sha256(body.encode('utf-8')).hexdigest()[:12]
+        stem, ext = os.path.splitext(name)
+        out = f'{DIST_DIR}/{stem}.{digest}{ext}'
+        with open(os.path.join(STATIC_DIR, out), 'w', encoding='utf-8') as f:
+            f.write(body)
+        manifest[name] = out
+        print(f'{name} -> static/{out} ({len(body)} bytes)')
+    with open(MANIFEST, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def load_manifest():
+    """Return the bundle -> hashed file map, or {} if assets were not built."""
+    try:
+        with open(MANIFEST, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+if __name__ == '__main__':
+    build()
@@ -0,0 +1,14 @@
+# db.py
+# Database connection settings shared by app.py and migrate.py.
+import os
+import psycopg2
+
+# ====== DB CONFIG (PGAdmin) ======
+DB_HOST = os.environ.get('DB_HOST', 'localhost')
+DB_NAME = os.environ.get('DB_NAME', 'swiftserve')
+DB_USER = os.environ.get('DB_USER', 'postgres')
+DB_PASS = os.environ.get('DB_PASS', 'Sachin@14')
+DB_PORT = os.environ.get('DB_PORT', '5432')
+
+def get_conn():
+    return psycopg2.connect(host=DB_HOST, dbname=DB_NAME, user=DB_USER, password=DB_PASS, port=DB_PORT)
@@ -0,0 +1,82 @@
+# migrate.py
+# Versioned schema migrations: applies migrations/NNNN_name.sql files in order,
+# each in its own transaction, and records them in schema_migrations.
+#
+#   python migrate.py          (run at deploy time, before starting app.py)
+import os
+import re
+from db import get_conn
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+# arbitrary key for pg_advisory_xact_lock so concurrent deploys don't race
+MIGRATION_LOCK_ID = 7311
+
+def list_migrations():
+    """Return [(version, name, path)] sorted by version."""
+    out = []
+    for fname in os.listdir(MIGRATIONS_DIR):
+        m = re.match(r'^(\d+)_(\w+)\.sql$', fname)
+        if m:
+            out.append((int(m.group(1)), m.group(2), os.path.join(MIGRATIONS_DIR, fname)))
+    return sorted(out)
+
+def applied_versions(conn):
+    """Set of applied migration versions (empty for an unmanaged database)."""
+    with conn:
+        cur = conn.cursor()
+        cur.execute("SELECT to_regclass('schema_migrations')")
+        if cur.fetchone()[0] is None:
+            cur.close(); return set()
+        cur.execute('SELECT version FROM schema_migrations')
+        versions = {row[0] for row in cur.fetchall()}
+        cur.close()
+    return versions
+
+def pending_migrations(conn):
+    """Shipped migrations not yet applied, including ones older than the newest applied."""
+    applied = applied_versions(conn)
+    return [(version, name) for version, name, _ in list_migrations() if version not in applied]
+
+def migrate(conn):
+    """Apply pending migrations; returns the list of versions applied."""
+    with conn:
+        cur = conn.cursor()
+        # lock before CREATE TABLE too: concurrent creates of the same table can
+        # fail on the pg_type unique index even with IF NOT EXISTS
+        cur.execute('SELECT pg_advisory_xact_lock(%s)', (MIGRATION_LOCK_ID,))
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations(
+              version INTEGER PRIMARY KEY,
+              name VARCHAR(200) NOT NULL,
+              applied_at TIMESTAMP DEFAULT NOW()
+            )
+        """)
+        cur.close()
+
+    applied = []
+    for version, name, path in list_migrations():
+        with open(path, encoding='utf-8') as f:
+            sql = f.read()
+        # `with conn` commits on success and rolls back the whole migration on error
+        with conn:
+            cur = conn.cursor()
+            cur.execute('SELECT pg_advisory_xact_lock(%s)', (MIGRATION_LOCK_ID,))
+            cur.execute('SELECT 1 FROM schema_migrations WHERE version=%s', (version,))
+            if cur.fetchone():
+                cur.close(); continue
+            cur.execute(sql)
+            cur.execute('INSERT INTO schema_migrations (version, name) VALUES (%s, %s)', (version, name))
+            cur.close()
+        applied.append(version)
+        print(f'applied {version:04d}_{name}')
+    return applied
+
+if __name__ == '__main__':
+    conn = get_conn()
+    try:
+        if not migrate(conn):
+            print('schema is up to date')
+        print(f'applied versions: {sorted(applied_versions(conn))}')
+    finally:
+        conn.close()
@@ -1,21 +1,17 @@
+-- SwiftServe v3 base schema for PostgreSQL (supports both online/local video).
+-- Safe on databases created from the old db.sql script.
 
--- SwiftServe v3 schema for PostgreSQL (supports both online/local video)
-DROP TABLE IF EXISTS order_items;
-DROP TABLE IF EXISTS orders;
-DROP TABLE IF EXISTS menu_items;
-DROP TABLE IF EXISTS restaurants;
-DROP TABLE IF EXISTS users;
-
-CREATE TABLE users(
+CREATE TABLE IF NOT EXISTS users(
   id SERIAL PRIMARY KEY,
   username VARCHAR(150) NOT NULL,
   gmail VARCHAR(255) UNIQUE NOT NULL,
   password_hash TEXT NOT NULL,
   role VARCHAR(30) NOT NULL CHECK (role IN ('customer','restaurant','agent')),
+  phone VARCHAR(30),
   created_at TIMESTAMP DEFAULT NOW()
 );
 
-CREATE TABLE restaurants(
+CREATE TABLE IF NOT EXISTS restaurants(
   id SERIAL PRIMARY KEY,
   owner_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
   name VARCHAR(200) NOT NULL,
@@ -25,7 +21,7 @@ CREATE TABLE restaurants(
   created_at TIMESTAMP DEFAULT NOW()
 );
 
-CREATE TABLE menu_items(
+CREATE TABLE IF NOT EXISTS menu_items(
   id SERIAL PRIMARY KEY,
   restaurant_id INTEGER NOT NULL REFERENCES restaurants(id) ON DELETE CASCADE,
   name VARCHAR(200) NOT NULL,
@@ -37,10 +33,12 @@ CREATE TABLE menu_items(
   created_at TIMESTAMP DEFAULT NOW()
 );
 
-CREATE TABLE orders(
+-- Order status flow: Placed → Preparing → Ready → Out for Delivery → Delivered (or Rejected)
+CREATE TABLE IF NOT EXISTS orders(
   id SERIAL PRIMARY KEY,
   user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
   restaurant_id INTEGER NOT NULL REFERENCES restaurants(id) ON DELETE CASCADE,
+  agent_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
   total_amount NUMERIC(10,2) NOT NULL,
   status VARCHAR(40) NOT NULL DEFAULT 'Placed',
   delivery_name VARCHAR(120),
@@ -49,7 +47,7 @@ CREATE TABLE orders(
   created_at TIMESTAMP DEFAULT NOW()
 );
 
-CREATE TABLE order_items(
+CREATE TABLE IF NOT EXISTS order_items(
   id SERIAL PRIMARY KEY,
   order_id INTEGER NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
   item_id INTEGER REFERENCES menu_items(id) ON DELETE SET NULL,
@@ -58,40 +56,6 @@ CREATE TABLE order_items(
   qty INTEGER NOT NULL
 );
 
-
-select * from users;
-
-DELETE FROM users;
-
-select* from order_items;
-
--- New Role: Delivery Agent
-CREATE TABLE delivery_agents (
-    id SERIAL PRIMARY KEY,
-    username VARCHAR(100) UNIQUE NOT NULL,
-    gmail VARCHAR(100) NOT NULL,
-    password_hash TEXT NOT NULL,
-    status VARCHAR(50) DEFAULT 'available'
-);
-
--- Add delivery_agent_id to orders table
-ALTER TABLE orders ADD COLUMN delivery_agent_id INTEGER REFERENCES delivery_agents(id);
-
--- Add new statuses for delivery flow
--- Placed → Preparing → Ready → Picked Up → Out for Delivery → Delivered
-
-select * from users;
-
-DELETE FROM users
-WHERE gmail = 'anil@gmail.com';
-
-ALTER TABLE orders
-ADD COLUMN agent_id INTEGER REFERENCES users(id) ON DELETE SET NULL;
-
+-- Columns the old script added with ad-hoc ALTERs
 ALTER TABLE users ADD COLUMN IF NOT EXISTS phone VARCHAR(30);
-
 ALTER TABLE orders ADD COLUMN IF NOT EXISTS agent_id INTEGER REFERENCES users(id) ON DELETE SET NULL;
-
--- Ensure order statuses support full flow:
--- Placed → Preparing → Ready → Out for Delivery → Delivered → Rejected
-
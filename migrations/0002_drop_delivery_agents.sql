@@ -0,0 +1,5 @@
+-- Agents are users with role='agent' and orders.agent_id points at users(id).
+-- The separate delivery_agents table and orders.delivery_agent_id were never used.
+
+ALTER TABLE orders DROP COLUMN IF EXISTS delivery_agent_id;
+DROP TABLE IF EXISTS delivery_agents;
@@ -0,0 +1,18 @@
+-- Indexes for the hot query paths in app.py
+
+-- customer_orders: WHERE user_id=? ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS orders_user_created_idx ON orders(user_id, created_at DESC);
+-- restaurant_orders: WHERE restaurant_id=? ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS orders_restaurant_created_idx ON orders(restaurant_id, created_at DESC);
+-- agent_dashboard / agent_orders: WHERE agent_id=? AND status ...
+CREATE INDEX IF NOT EXISTS orders_agent_status_idx ON orders(agent_id, status);
+-- agent_dashboard / agent_available_json: unassigned Ready orders, oldest first
+CREATE INDEX IF NOT EXISTS orders_ready_unassigned_idx ON orders(created_at)
+  WHERE status = 'Ready' AND agent_id IS NULL;
+
+-- restaurant lookup by owner on every restaurant page
+CREATE INDEX IF NOT EXISTS restaurants_owner_idx ON restaurants(owner_id);
+-- menu pages: WHERE restaurant_id=?
+CREATE INDEX IF NOT EXISTS menu_items_restaurant_idx ON menu_items(restaurant_id);
+-- order details: WHERE order_id=?
+CREATE INDEX IF NOT EXISTS order_items_order_idx ON order_items(order_id);
@@ -52,7 +52,55 @@ socket.on('order_update', data => {
   if (orderDiv && parseInt(orderDiv.dataset.orderId) === data.order_id) {
     const statusEl = document.getElementById('order-status');
     if (statusEl) statusEl.textContent = data.status;
+    // the server only tracks orders that are Out for Delivery
+    const liveEl = document.getElementById('live-location');
+    if (liveEl && data.status !== 'Out for Delivery') { liveEl.hidden = true; livePos = null; }
   }
+
+  // --- Agents stop sharing location for orders that left Out for Delivery ---
+  if (data.status !== 'Out for Delivery' && trackedOrders.delete(data.order_id) && !trackedOrders.size) {
+    if (locationWatch !== null) navigator.geolocation.clearWatch(locationWatch);
+    locationWatch = null;
+  }
+});
+
+// --- Live Delivery Tracking (customer side) ---
+// Server sends {o, k:[lat,lng]} keyframes and {o, d:[dlat,dlng]} deltas,
+// both in 1e-5 degree units.
+let livePos = null;
+socket.on('agent_location', data => {
+  const orderDiv = document.querySelector('[data-order-id]');
+  if (!orderDiv || parseInt(orderDiv.dataset.orderId) !== data.o) return;
+  if (data.k) livePos = data.k.slice();
+  else if (data.d && livePos) { livePos[0] += data.d[0]; livePos[1] += data.d[1]; }
+  else return; // delta before any keyframe; wait for the next one
+
+  const liveEl = document.getElementById('live-location');
+  if (!liveEl) return;
+  const lat = (livePos[0] / 1e5).toFixed(5), lng = (livePos[1] / 1e5).toFixed(5);
+  liveEl.hidden = false;
+  liveEl.querySelector('.live-coords').textContent = `${lat}, ${lng}`;
+  liveEl.querySelector('.live-map').href = `https://www.openstreetmap.org/?mlat=${lat}&mlon=${lng}#map=17/${lat}/${lng}`;
+  liveEl.querySelector('.live-time').textContent = new Date().toLocaleTimeString();
+});
+
+// --- Live Delivery Tracking (agent side) ---
+// Agents push GPS fixes for their active deliveries; the server throttles them.
+const trackedOrders = new Set([...document.querySelectorAll('[data-track-order-id]')]
+  .map(el => parseInt(el.dataset.trackOrderId)));
+let locationWatch = null;
+if (trackedOrders.size && navigator.geolocation) {
+  locationWatch = navigator.geolocation.watchPosition(pos => {
+    trackedOrders.forEach(id => socket.emit('agent_location', {
+      order_id: id, lat: pos.coords.latitude, lng: pos.coords.longitude
+    }));
+  }, () => { }, { enableHighAccuracy: true, maximumAge: 1000 });
+}
+
+// (Re)join the order room on every connect so reconnects keep receiving updates
+socket.on('connect', () => {
+  const orderDiv = document.querySelector('[data-order-id]');
+  if (orderDiv) socket.emit('join_order_room', { order_id: parseInt(orderDiv.dataset.orderId) });
 });
 
 socket.on('connect', () => console.log('Socket connected ✅'));